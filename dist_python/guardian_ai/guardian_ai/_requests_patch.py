@@ -0,0 +1,85 @@
+"""
+Routing of AI API calls made with the requests library through Guardian.
+
+This module is imported lazily by guardian.py, so requests is only loaded
+once a Guardian instance patches it.
+"""
+
+from functools import lru_cache
+from urllib.parse import urlparse
+
+from requests.adapters import HTTPAdapter
+
+from . import guardian as _guardian
+
+
+@lru_cache(maxsize=1024)
+def _parse_url(url: str):
+    """
+    Parse a URL, memoized since clients hit the same few endpoints repeatedly.
+    """
+    return urlparse(url)
+
+
+# HTTPAdapter.send as shipped by requests, captured before install() replaces it
+_original_send = HTTPAdapter.send
+
+
+def _guardian_send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+    """
+    HTTPAdapter.send replacement that routes AI API calls through the active
+    Guardian proxy.
+
+    Requests that do not target an AI endpoint, or that are sent while no
+    Guardian is running, are sent unchanged.
+    """
+    guardian = _guardian._ACTIVE_GUARDIAN
+    # Requests that already carry the header are addressed to the proxy itself
+    if (
+        guardian is not None
+        and guardian.ready
+        and guardian._AI_RE.search(request.url)
+        and _guardian.ORIGINAL_DESTINATION_HEADER not in request.headers
+    ):
+        _guardian.logger.debug("Routing AI API call through Guardian: %s", request.url)
+        
+        # Preserve original URL
+        request.headers[_guardian.ORIGINAL_DESTINATION_HEADER] = request.url
+        
+        # Route through Guardian proxy
+        parsed_url = _parse_url(request.url)
+        if parsed_url.query:
+            request.url = "".join((guardian._proxy_base, parsed_url.path, "?", parsed_url.query))
+        else:
+            request.url = guardian._proxy_base + parsed_url.path
+        
+        # Use Guardian's long-lived pool so connections to the proxy are
+        # kept alive across sessions (requests.post builds one per call).
+        # The session resolved proxies for the original URL; the loopback
+        # proxy must be reached directly, so those are dropped.
+        return _original_send(guardian._proxy_adapter, request, stream, timeout, verify, cert, {})
+    
+    return _original_send(self, request, stream, timeout, verify, cert, proxies)
+
+
+def install() -> None:
+    """
+    Route AI calls from every requests session through Guardian.
+
+    The check is installed on HTTPAdapter itself, so sessions and adapter
+    subclasses created before Guardian started are covered as well.
+    Installed at most once per process; the adapter dispatches to whichever
+    Guardian is active at send time.
+    """
+    if HTTPAdapter.send is not _guardian_send:
+        HTTPAdapter.send = _guardian_send
+
+
+def new_proxy_adapter() -> HTTPAdapter:
+    """
+    Create the keep-alive connection pool a Guardian uses for routed calls.
+    
+    Returns:
+        HTTPAdapter: Adapter with room for many concurrent proxy connections
+    """
+    return HTTPAdapter(pool_maxsize=512)
@@ -3,12 +3,24 @@ Command-line interface for Guardian AI
 """
 
 import argparse
+import asyncio
 import sys
 import time
 import signal
 from . import Guardian, __version__
 
 
+async def _wait_for_shutdown():
+    """
+    Wait until SIGINT or SIGTERM is received, without waking up while idle.
+    """
+    loop = asyncio.get_running_loop()
+    stop_event = asyncio.Event()
+    loop.add_signal_handler(signal.SIGINT, stop_event.set)
+    loop.add_signal_handler(signal.SIGTERM, stop_event.set)
+    await stop_event.wait()
+
+
 def main():
     """
     Main entry point for the Guardian AI command-line interface.
@@ -80,7 +92,15 @@ def main():
         print(f"Guardian AI v{__version__} proxy server started on port {guardian.port}")
         print("Press Ctrl+C to exit")
         
-        # Set up signal handler for graceful shutdown
+        if sys.platform != "win32":
+            # Block on the event loop until a shutdown signal arrives
+            asyncio.run(_wait_for_shutdown())
+            print("\nShutting down Guardian AI...")
+            guardian.stop()
+            print("Guardian AI stopped.")
+            return 0
+        
+        # Windows has no loop.add_signal_handler; use signal handlers instead
         def signal_handler(sig, frame):
             print("\nShutting down Guardian AI...")
             guardian.stop()
@@ -14,13 +14,13 @@ import logging
 import platform
 import signal
 import atexit
-import requests
+import re
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Optional
 import sys
 import http.client
 import urllib.request
-from functools import wraps
+from functools import lru_cache
 
 # Setup logging
 logger = logging.getLogger("guardian_ai")
@@ -34,6 +34,150 @@ DEFAULT_CONFIG = {
     "auto_start": True
 }
 
+# Normalized (system, machine) of the host, detected once at import time
+_PLATFORM = (platform.system().lower(), platform.machine().lower())
+_IS_WINDOWS = _PLATFORM[0] == "windows"
+
+# Map architecture names
+_ARCH_MAPPING = {
+    'x86_64': 'x64',
+    'amd64': 'x64',
+    'i386': 'x86',
+    'i686': 'x86',
+    'aarch64': 'arm64',
+    'arm64': 'arm64',
+}
+
+# Map system names
+_SYSTEM_MAPPING = {
+    'darwin': 'darwin',
+    'linux': 'linux',
+    'windows': 'win32',
+}
+
+# URL fragments identifying AI completion/chat endpoints
+AI_ENDPOINT_MARKERS = (
+    '/completions',
+    '/chat/completions',
+    '/generate',
+    '/v1/engines',
+    '/v1/chat',
+)
+
+# Times start() tries a fresh port when the binary exits before becoming ready
+_START_ATTEMPTS = 3
+
+# Header carrying the URL the request was originally meant for
+ORIGINAL_DESTINATION_HEADER = "X-Guardian-Original-Destination"
+
+
+# Parsed rules files keyed by path, as (st_mtime_ns, rules)
+_RULES_CACHE: Dict[str, tuple] = {}
+
+
+def _load_rules(path: str) -> Optional[list]:
+    """
+    Load the rules list from a guardian_rules.json file.
+    
+    Parsed rules are cached per path and the file is only read again when
+    its modification time changes.
+    
+    Args:
+        path: Path to the rules file
+        
+    Returns:
+        Optional[list]: The rules, or None if the file does not exist
+        
+    Raises:
+        ValueError: If the file is not a JSON object with a "rules" list
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    
+    cached = _RULES_CACHE.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        data = json.load(f)
+    if not (isinstance(data, dict) and isinstance(data.get("rules"), list)):
+        raise ValueError('expected a JSON object with a "rules" list')
+    
+    rules = data["rules"]
+    _RULES_CACHE[path] = (mtime, rules)
+    return rules
+
+
+@lru_cache(maxsize=1)
+def _resolve_binary_path() -> str:
+    """
+    Find the Guardian binary path based on the current platform.
+    
+    The result is cached, so repeated Guardian instances do not stat the
+    filesystem again.
+    
+    Returns:
+        str: Path to the Guardian binary
+    """
+    # Get base directory containing this file
+    base_dir = Path(__file__).parent.parent.parent
+    
+    # Get normalized system and architecture
+    system, machine = _PLATFORM
+    norm_system = _SYSTEM_MAPPING.get(system, system)
+    norm_arch = _ARCH_MAPPING.get(machine, machine)
+    
+    # Construct platform-specific path
+    binary_name = "guardian"
+    if system == "windows":
+        binary_name += ".exe"
+    
+    # Try platform-specific binary directory first
+    platform_dir = f"{norm_system}-{norm_arch}"
+    binary_path = os.path.join(base_dir, "bin", platform_dir, binary_name)
+    
+    if os.path.exists(binary_path):
+        return binary_path
+    
+    # Try the base bin directory
+    binary_path = os.path.join(base_dir, "bin", binary_name)
+    if os.path.exists(binary_path):
+        return binary_path
+    
+    # Fall back to the root directory
+    binary_path = os.path.join(base_dir, binary_name)
+    if os.path.exists(binary_path):
+        return binary_path
+    
+    # Return the default path even if it doesn't exist yet
+    return binary_path
+
+
+# Guardian instance AI calls are currently routed to, set while it is running
+_ACTIVE_GUARDIAN: Optional["Guardian"] = None
+
+
+def _patch_requests_module():
+    """
+    Make requests sessions route AI API calls through Guardian.
+    
+    requests is only imported here, so applications that never use it don't
+    pay for loading it when importing guardian_ai.
+    
+    Returns:
+        The requests patch module, or None if requests is not installed
+    """
+    try:
+        from . import _requests_patch
+    except ImportError:
+        logger.debug("requests is not installed, not patching it")
+        return None
+    
+    _requests_patch.install()
+    return _requests_patch
+
 
 class Guardian:
     """
@@ -43,6 +187,9 @@ class Guardian:
     handles monitoring and governing of AI API calls in Python applications.
     """
     
+    # Single case-insensitive pass over the URL instead of one scan per marker
+    _AI_RE = re.compile("|".join(map(re.escape, AI_ENDPOINT_MARKERS)), re.IGNORECASE)
+    
     def __init__(self, config: Dict = None):
         """
         Initialize a new Guardian instance with the given configuration.
@@ -51,16 +198,34 @@ class Guardian:
             config: Configuration dictionary that overrides default config
         """
         self.config = {**DEFAULT_CONFIG, **(config or {})}
+        
+        # Log arguments are only formatted when debug is enabled
+        if self.config.get("debug"):
+            logger.setLevel(logging.DEBUG)
+            if not logger.handlers:
+                handler = logging.StreamHandler(sys.stdout)
+                handler.setFormatter(logging.Formatter("[Guardian] %(message)s"))
+                logger.addHandler(handler)
+                # Our handler prints the messages, don't repeat them through the app's root handlers
+                logger.propagate = False
+        
         self.port = None
+        self._proxy_base = None
         self.process = None
         self.ready = False
         self.original_urlopen = urllib.request.urlopen
+        self._async_client = None
+        self._async_client_loop = None
+        self._close_task = None
         
         # Patch requests library for monitoring
-        self._patch_requests_module()
+        requests_patch = _patch_requests_module()
+        
+        # Keep-alive connection pool shared by all calls routed to the proxy
+        self._proxy_adapter = requests_patch.new_proxy_adapter() if requests_patch else None
         
         # Find the binary path
-        self.binary_path = self._find_binary_path()
+        self.binary_path = _resolve_binary_path()
         
         # Automatically start Guardian if auto_start is enabled
         if self.config.get("auto_start", True):
@@ -81,21 +246,17 @@ class Guardian:
         """
         try:
             if self.process:
-                self.log("Guardian already running")
+                logger.debug("Guardian already running")
                 return
             
-            # Find a free port to use
-            self.port = self._find_free_port()
-            self.log(f"Starting Guardian proxy on port {self.port}")
-            
             # Check if binary exists
             if not os.path.exists(self.binary_path):
                 raise RuntimeError(f"Guardian binary not found at {self.binary_path}")
             
-            # Prepare arguments for the Guardian binary
+            # Prepare arguments for the Guardian binary; the port is filled in per attempt
             args = [
                 self.binary_path,
-                f"-port={self.port}",
+                None,
                 f"-service={self.config['service_name']}",
                 f"-env={self.config['environment']}"
             ]
@@ -104,12 +265,16 @@ class Guardian:
             user_root_rules_path = os.path.join(os.getcwd(), 'guardian_rules.json')
             user_src_rules_path = os.path.join(os.getcwd(), 'src', 'guardian_rules.json')
             
-            if os.path.exists(user_root_rules_path):
-                args.append(f"-config={user_root_rules_path}")
-                self.log(f"Using rules from {user_root_rules_path}")
-            elif os.path.exists(user_src_rules_path):
-                args.append(f"-config={user_src_rules_path}")
-                self.log(f"Using rules from {user_src_rules_path}")
+            for rules_path in (user_root_rules_path, user_src_rules_path):
+                try:
+                    rules = _load_rules(rules_path)
+                except ValueError as e:
+                    logger.warning("Ignoring invalid rules file %s: %s", rules_path, e)
+                    continue
+                if rules is not None:
+                    args.append(f"-rules={json.dumps(rules)}")
+                    logger.debug("Using rules from %s", rules_path)
+                    break
             
             if self.config.get("pre_prompt"):
                 args.append(f"-pre-prompt={self.config['pre_prompt']}")
@@ -117,20 +282,34 @@ class Guardian:
             if self.config.get("debug"):
                 args.append("-debug=true")
             
-            # Start the Guardian process
-            if self.config.get("debug"):
-                self.process = subprocess.Popen(args)
+            # Another process can take the free port before the binary binds it.
+            # The binary then exits, so start it again on a new port.
+            for _ in range(_START_ATTEMPTS):
+                self.port = self._find_free_port()
+                args[1] = f"-port={self.port}"
+                
+                # Use the loopback address directly so no request goes through name resolution
+                self._proxy_base = f"http://127.0.0.1:{self.port}"
+                logger.debug("Starting Guardian proxy on port %s", self.port)
+                
+                # Start the Guardian process and wait for it to be ready
+                self._spawn(args)
+                if self._wait_for_ready():
+                    break
+                
+                logger.debug("Guardian exited with code %s before becoming ready", self.process.returncode)
+                self.process = None
             else:
-                # Redirect output to /dev/null or NUL on Windows
-                devnull = open(os.devnull, 'wb')
-                self.process = subprocess.Popen(args, stdout=devnull, stderr=devnull)
+                raise RuntimeError(f"Guardian server failed to start after {_START_ATTEMPTS} attempts")
             
-            # Wait for server to be ready
-            self._wait_for_ready()
             self.ready = True
-            self.log('Guardian proxy is ready')
+            
+            # Route AI calls made through requests to this instance
+            global _ACTIVE_GUARDIAN
+            _ACTIVE_GUARDIAN = self
+            logger.debug('Guardian proxy is ready')
         except Exception as e:
-            self.log(f"Error starting Guardian: {str(e)}")
+            logger.debug("Error starting Guardian: %s", e)
             raise
     
     def stop(self) -> None:
@@ -138,16 +317,60 @@ class Guardian:
         Stop the Guardian proxy server and restore original network behavior.
         """
         if self.process:
-            self.log('Stopping Guardian proxy')
-            if platform.system() == "Windows":
-                self.process.kill()  # Use kill on Windows
-            else:
-                self.process.terminate()  # Use SIGTERM on Unix
+            logger.debug('Stopping Guardian proxy')
+            self._terminate_process()
             self.process = None
             self.ready = False
+            self._close_async_client()
         
+        if self._proxy_adapter is not None:
+            self._proxy_adapter.close()
         self._restore_network_behavior()
     
+    def _terminate_process(self, timeout: float = 5) -> None:
+        """
+        Ask the Guardian process group to shut down, killing it after the timeout.
+        
+        Args:
+            timeout: Time to wait for a graceful shutdown in seconds
+        """
+        process = self.process
+        try:
+            if _IS_WINDOWS:
+                process.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            logger.debug("Guardian did not exit in time, killing it")
+            if _IS_WINDOWS:
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+        except ProcessLookupError:
+            # Already exited
+            pass
+    
+    def _spawn(self, args: list) -> None:
+        """
+        Start the Guardian binary in its own process group.
+        
+        Args:
+            args: Command line for the Guardian binary
+        """
+        # Discard output unless debugging; DEVNULL leaves no file open in the parent
+        output = None if self.config.get("debug") else subprocess.DEVNULL
+        self.process = subprocess.Popen(
+            args,
+            stdout=output,
+            stderr=output,
+            close_fds=True,
+            # Own process group, so stop() can signal the binary and its children together
+            start_new_session=not _IS_WINDOWS,
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if _IS_WINDOWS else 0
+        )
+    
     def _find_free_port(self) -> int:
         """
         Find a free port to use for the Guardian proxy.
@@ -159,160 +382,139 @@ class Guardian:
             s.bind(('', 0))
             return s.getsockname()[1]
     
-    def _wait_for_ready(self, timeout: int = 10) -> None:
+    def _wait_for_ready(self, timeout: int = 10) -> bool:
         """
         Wait for the Guardian server to be ready.
         
         Args:
             timeout: Maximum time to wait in seconds
             
+        Returns:
+            bool: True once the server is ready, False if the process exited first
+            
         Raises:
             RuntimeError: If the server does not become ready within the timeout
         """
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                response = requests.get(f"http://localhost:{self.port}/_guardian/health", timeout=0.5)
-                if response.status_code == 200:
-                    return
-            except requests.RequestException:
-                pass
-            time.sleep(0.1)
+        deadline = time.monotonic() + timeout
+        delay = 0.002
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                return False
+            
+            # Cheap TCP probe first; only talk HTTP once the port accepts connections
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.settimeout(0.05)
+                connected = s.connect_ex(("127.0.0.1", self.port)) == 0
+            
+            if connected and self._health_check():
+                return True
+            
+            time.sleep(delay)
+            delay = min(0.05, delay * 1.5)
         
         raise RuntimeError("Guardian server failed to start within timeout")
     
-    def _patch_requests_module(self) -> None:
+    def _health_check(self) -> bool:
         """
-        Patch the requests library to route AI API calls through Guardian.
+        Query the Guardian health endpoint.
+        
+        Returns:
+            bool: True if the server answered with HTTP 200, False otherwise
         """
-        if not hasattr(requests, 'original_request'):
-            # Store the original request function
-            requests.original_request = requests.Session.request
-            
-            # Create a patched request method
-            @wraps(requests.Session.request)
-            def patched_request(session, method, url, *args, **kwargs):
-                if self.ready and self._is_ai_endpoint(url):
-                    self.log(f"Routing AI API call through Guardian: {url}")
-                    
-                    # Preserve original URL
-                    original_url = url
-                    
-                    # Add header for original destination
-                    headers = kwargs.get('headers', {})
-                    headers['X-Guardian-Original-Destination'] = original_url
-                    kwargs['headers'] = headers
-                    
-                    # Route through Guardian proxy
-                    parsed_url = requests.utils.urlparse(url)
-                    proxy_url = f"http://localhost:{self.port}{parsed_url.path}"
-                    if parsed_url.query:
-                        proxy_url += f"?{parsed_url.query}"
-                    
-                    return requests.original_request(session, method, proxy_url, *args, **kwargs)
-                
-                # Not an AI endpoint or Guardian not ready
-                return requests.original_request(session, method, url, *args, **kwargs)
-            
-            # Apply the patch
-            requests.Session.request = patched_request
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=0.5)
+        try:
+            conn.request("GET", "/_guardian/health")
+            return conn.getresponse().status == 200
+        except (OSError, http.client.HTTPException):
+            return False
+        finally:
+            conn.close()
     
     def _restore_network_behavior(self) -> None:
         """
-        Restore original network behavior by removing patches.
+        Restore original network behavior by no longer routing through this instance.
         """
-        if hasattr(requests, 'original_request'):
-            requests.Session.request = requests.original_request
-            self.log("Restored original requests behavior")
+        global _ACTIVE_GUARDIAN
+        if _ACTIVE_GUARDIAN is self:
+            _ACTIVE_GUARDIAN = None
+            logger.debug("Restored original requests behavior")
     
-    def _is_ai_endpoint(self, url: str) -> bool:
+    def _is_ai_endpoint(self, path: str) -> bool:
         """
-        Check if a URL is for an AI endpoint that should be monitored.
+        Check if a URL path is for an AI endpoint that should be monitored.
         
         Args:
-            url: The URL to check
+            path: The URL path to check (a full URL also works)
             
         Returns:
-            bool: True if the URL is an AI endpoint, False otherwise
+            bool: True if the path is an AI endpoint, False otherwise
         """
-        url_lower = url.lower()
-        return (
-            '/completions' in url_lower or
-            '/chat/completions' in url_lower or
-            '/generate' in url_lower or
-            '/v1/engines' in url_lower or
-            '/v1/chat' in url_lower
-        )
+        return self._AI_RE.search(path) is not None
     
-    def _find_binary_path(self) -> str:
+    def _get_async_client(self):
         """
-        Find the Guardian binary path based on the current platform.
+        Get the shared async HTTP client used to forward requests to Guardian.
+        
+        The client is created on first use and keeps a pool of keep-alive
+        connections to the proxy.
         
         Returns:
-            str: Path to the Guardian binary
+            httpx.AsyncClient: Client bound to the Guardian proxy
         """
-        # Get base directory containing this file
-        base_dir = Path(__file__).parent.parent.parent
-        
-        # Determine binary name based on platform
-        system = platform.system().lower()
-        machine = platform.machine().lower()
-        
-        # Map architecture names
-        arch_mapping = {
-            'x86_64': 'x64',
-            'amd64': 'x64',
-            'i386': 'x86',
-            'i686': 'x86',
-            'aarch64': 'arm64',
-            'arm64': 'arm64',
-        }
-        
-        # Map system names
-        system_mapping = {
-            'darwin': 'darwin',
-            'linux': 'linux',
-            'windows': 'win32',
-        }
-        
-        # Get normalized system and architecture
-        norm_system = system_mapping.get(system, system)
-        norm_arch = arch_mapping.get(machine, machine)
-        
-        # Construct platform-specific path
-        binary_name = "guardian"
-        if system == "windows":
-            binary_name += ".exe"
-        
-        # Try platform-specific binary directory first
-        platform_dir = f"{norm_system}-{norm_arch}"
-        binary_path = os.path.join(base_dir, "bin", platform_dir, binary_name)
+        if self._async_client is None:
+            import asyncio
+            import httpx
+            
+            # The client's connections belong to this loop, so it is closed on it too
+            self._async_client_loop = asyncio.get_running_loop()
+            self._async_client = httpx.AsyncClient(
+                base_url=self._proxy_base,
+                timeout=30,
+                limits=httpx.Limits(max_connections=1024, max_keepalive_connections=256)
+            )
+        return self._async_client
+    
+    def _close_async_client(self) -> None:
+        """
+        Close the async client and its keep-alive connections to the proxy.
         
-        if os.path.exists(binary_path):
-            return binary_path
+        The client can only be closed on the event loop it was used on, so the
+        close is scheduled there if that loop is still running.
+        """
+        client, loop = self._async_client, self._async_client_loop
+        self._async_client = self._async_client_loop = None
+        if client is None:
+            return
         
-        # Try the base bin directory
-        binary_path = os.path.join(base_dir, "bin", binary_name)
-        if os.path.exists(binary_path):
-            return binary_path
+        import asyncio
         
-        # Fall back to the root directory
-        binary_path = os.path.join(base_dir, binary_name)
-        if os.path.exists(binary_path):
-            return binary_path
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
         
-        # Return the default path even if it doesn't exist yet
-        return binary_path
+        try:
+            if loop is running_loop:
+                # Keep a reference, the loop only holds tasks weakly
+                self._close_task = loop.create_task(client.aclose())
+            elif loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+            elif not loop.is_closed():
+                loop.run_until_complete(client.aclose())
+            else:
+                # The loop is gone; its transports close their sockets when collected
+                logger.debug("Event loop of the Guardian client is closed, dropping the client")
+        except Exception as e:
+            logger.debug("Error closing Guardian client: %s", e)
     
     def log(self, message: str) -> None:
         """
-        Log a message if debug is enabled.
+        Log a debug message.
         
         Args:
             message: The message to log
         """
-        if self.config.get("debug", False):
-            print(f"[Guardian] {message}")
+        logger.debug("%s", message)
     
     def create_fastapi_middleware(self):
         """
@@ -323,6 +525,8 @@ class Guardian:
         """
         from fastapi import Request
         from starlette.middleware.base import BaseHTTPMiddleware
+        from starlette.background import BackgroundTask
+        from starlette.responses import Response, StreamingResponse
         from starlette.types import ASGIApp
         
         guardian_instance = self
@@ -333,10 +537,10 @@ class Guardian:
             
             async def dispatch(self, request: Request, call_next):
                 # Check if this is an AI endpoint
-                if not guardian_instance.ready or not guardian_instance._is_ai_endpoint(str(request.url)):
+                if not guardian_instance.ready or not guardian_instance._is_ai_endpoint(request.url.path):
                     return await call_next(request)
                 
-                guardian_instance.log(f"FastAPI middleware handling AI endpoint: {request.url.path}")
+                logger.debug("FastAPI middleware handling AI endpoint: %s", request.url.path)
                 
                 # Get the original request details
                 method = request.method
@@ -344,35 +548,46 @@ class Guardian:
                 headers = dict(request.headers)
                 
                 # Add original destination header
-                headers["X-Guardian-Original-Destination"] = url
+                headers[ORIGINAL_DESTINATION_HEADER] = url
                 
                 # Forward the request to Guardian proxy
-                proxy_url = f"http://localhost:{guardian_instance.port}{request.url.path}"
-                if request.url.query:
-                    proxy_url += f"?{request.url.query}"
+                path = request.url.path
+                query = request.url.query
+                proxy_path = "".join((path, "?", query)) if query else path
+                
+                # Once the body has been read from the client it can't be replayed,
+                # so the app can no longer handle the request as a fallback
+                body_consumed = False
                 
-                # Read the body if it exists
-                body = await request.body()
+                async def body():
+                    nonlocal body_consumed
+                    body_consumed = True
+                    async for chunk in request.stream():
+                        yield chunk
                 
-                # Make the request to Guardian proxy
+                # Make the request to Guardian proxy, streaming the body both ways
+                # so the payload is never buffered in full
                 try:
-                    response = requests.request(
-                        method=method,
-                        url=proxy_url,
+                    client = guardian_instance._get_async_client()
+                    proxy_request = client.build_request(
+                        method,
+                        proxy_path,
                         headers=headers,
-                        data=body,
-                        timeout=30
+                        content=body()
                     )
+                    response = await client.send(proxy_request, stream=True)
                     
                     # Return the response from Guardian
-                    from starlette.responses import Response
-                    return Response(
-                        content=response.content,
+                    return StreamingResponse(
+                        response.aiter_raw(),
                         status_code=response.status_code,
-                        headers=dict(response.headers)
+                        headers=dict(response.headers),
+                        background=BackgroundTask(response.aclose)
                     )
                 except Exception as e:
-                    guardian_instance.log(f"Error forwarding request to Guardian: {str(e)}")
+                    logger.debug("Error forwarding request to Guardian: %s", e)
+                    if body_consumed:
+                        return Response("Error forwarding request to Guardian", status_code=502)
                     # Fall back to normal request handling
                     return await call_next(request)
         
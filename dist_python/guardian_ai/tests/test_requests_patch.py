@@ -0,0 +1,77 @@
+"""
+Tests for routing requests calls through the Guardian proxy.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+from guardian_ai import guardian as guardian_module
+from guardian_ai.guardian import Guardian, ORIGINAL_DESTINATION_HEADER
+
+
+def _serve(body: bytes):
+    """
+    Start a local HTTP server answering every POST with the given body.
+
+    Returns:
+        The server; ``server.hits`` counts the requests it received
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            server.hits += 1
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    server.hits = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def guardian_proxy(monkeypatch):
+    """
+    A ready Guardian instance whose proxy is a local stand-in server.
+    """
+    server = _serve(b"from guardian")
+    guardian = Guardian({"auto_start": False})
+    guardian.ready = True
+    guardian._proxy_base = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(guardian_module, "_ACTIVE_GUARDIAN", guardian)
+    yield server
+    server.shutdown()
+
+
+def test_session_created_before_guardian_is_routed(guardian_proxy):
+    session = requests.Session()
+
+    response = session.post("https://api.example.invalid/v1/chat/completions", json={})
+
+    assert response.text == "from guardian"
+    assert guardian_proxy.hits == 1
+
+
+def test_routed_call_ignores_environment_proxies(guardian_proxy, monkeypatch):
+    corporate_proxy = _serve(b"from corporate proxy")
+    proxy_url = f"http://127.0.0.1:{corporate_proxy.server_port}"
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "http_proxy", "https_proxy"):
+        monkeypatch.setenv(name, proxy_url)
+    for name in ("NO_PROXY", "no_proxy"):
+        monkeypatch.setenv(name, "localhost,127.0.0.1")
+
+    response = requests.post("https://api.example.invalid/v1/chat/completions", json={})
+
+    assert response.text == "from guardian"
+    assert response.request.headers[ORIGINAL_DESTINATION_HEADER] == \
+        "https://api.example.invalid/v1/chat/completions"
+    assert corporate_proxy.hits == 0
+    corporate_proxy.shutdown()
@@ -2,12 +2,13 @@
 Test script to simulate user interactions with the mock AI service.
 """
 
-import requests
+import asyncio
+import aiohttp
+import orjson
 import time
 import sys
 import math
 import random
-from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
 # Base API URL
@@ -35,11 +36,20 @@ ENHANCED_PROMPTS = [
 ALL_PROMPTS = TEST_PROMPTS + ENHANCED_PROMPTS
 USER_IDS = [f"user-{i}" for i in range(1, 11)]
 
-def send_chat_request(prompt: str, user_id: str = "test-user") -> Optional[Dict[str, Any]]:
+# Maximum number of requests in flight at once
+MAX_CONCURRENCY = 512
+
+# Parts of the request that are the same for every call
+CHAT_URL = f"{API_URL}/api/chat"
+SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful assistant."}
+MODEL = "mock-gpt-3.5-turbo"
+
+async def send_chat_request(session: aiohttp.ClientSession, prompt: str, user_id: str = "test-user") -> Optional[Dict[str, Any]]:
     """
     Send a chat request to the API.
     
     Args:
+        session: HTTP session to send the request with
         prompt: The prompt text to send
         user_id: User identifier for the request
         
@@ -49,23 +59,23 @@ def send_chat_request(prompt: str, user_id: str = "test-user") -> Optional[Dict[
     try:
         print(f"[{user_id}] Sending: \"{prompt}\"")
         
-        response = requests.post(
-            f"{API_URL}/api/chat",
-            json={
+        async with session.post(
+            CHAT_URL,
+            data=orjson.dumps({
                 "messages": [
-                    {"role": "system", "content": "You are a helpful assistant."},
+                    SYSTEM_MESSAGE,
                     {"role": "user", "content": prompt}
                 ],
-                "model": "mock-gpt-3.5-turbo"
-            },
+                "model": MODEL
+            }),
             headers={
                 "Content-Type": "application/json",
                 "User-Id": user_id,
                 "X-Forwarded-For": "192.168.1.101"
             }
-        )
+        ) as response:
+            data = orjson.loads(await response.read())
         
-        data = response.json()
         content = data["choices"][0]["message"]["content"]
         print(f"[{user_id}] Received: \"{content[:50]}...\"")
         return data
@@ -73,30 +83,50 @@ def send_chat_request(prompt: str, user_id: str = "test-user") -> Optional[Dict[
         print(f"[{user_id}] Error: {str(e)}")
         return None
 
-def run_tests():
+async def run_tests():
     """
     Run a high-volume stress test for 60 seconds using sinusoidal request rates.
     """
     print("Starting stress test for 60 seconds with sinusoidal request rate...")
     duration = 60
-    start = time.time()
     period = 10
-    with ThreadPoolExecutor(max_workers=500) as executor:
-        while time.time() - start < duration:
-            elapsed = time.time() - start
+    two_pi_over_period = 2 * math.pi / period
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+    pending = set()
+    
+    async def send_limited(session, prompt, user_id):
+        async with semaphore:
+            await send_chat_request(session, prompt, user_id)
+    
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        # Token bucket refilled at the current target rate, so submissions
+        # follow the sinusoid smoothly instead of bursting once per second
+        start = previous = time.monotonic()
+        tokens = 0.0
+        while time.monotonic() - start < duration:
+            now = time.monotonic()
+            elapsed = now - start
             # Sinusoidal variation around 50 req/s
-            rate = 50 + 30 * math.sin(2 * math.pi * elapsed / period)
-            count = max(1, int(rate))
-            for _ in range(count):
+            rate = 50 + 30 * math.sin(two_pi_over_period * elapsed)
+            tokens += (now - previous) * rate
+            previous = now
+            while tokens >= 1:
                 prompt = random.choice(ALL_PROMPTS)
                 user_id = random.choice(USER_IDS)
-                executor.submit(send_chat_request, prompt, user_id)
-            time.sleep(1)
+                task = asyncio.create_task(send_limited(session, prompt, user_id))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                tokens -= 1
+            await asyncio.sleep(0.002)
+        
+        # Let in-flight requests finish before closing the session
+        await asyncio.gather(*pending)
     print("Stress test completed.")
 
 if __name__ == "__main__":
     try:
-        run_tests()
+        asyncio.run(run_tests())
     except Exception as e:
         print(f"Test error: {str(e)}")
         sys.exit(1)
\ No newline at end of file
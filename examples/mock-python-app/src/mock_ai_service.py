@@ -2,70 +2,108 @@
 Mock AI Service to simulate OpenAI-like APIs without actually calling an LLM.
 """
 
+import asyncio
 import random
 import re
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+
+# Random source for response selection, delays and token counts
+_rng = random.Random()
+
+# Keywords that select a response category
+_CODING_KWS = ("code", "program", "function")
+_CREATIVE_KWS = ("creative", "story", "imagine")
+_FACTUAL_KWS = ("explain", "what is", "how does")
+
+# Categories in order of precedence with their keywords
+_CATEGORY_KEYWORDS = (
+    ("coding", _CODING_KWS),
+    ("creative", _CREATIVE_KWS),
+    ("factual", _FACTUAL_KWS)
+)
+
+# Matches every keyword occurrence (overlapping ones too) in one
+# case-insensitive pass; the named group that matched is the category
+_CATEGORY_RE = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{category}>{'|'.join(map(re.escape, keywords))})"
+        for category, keywords in _CATEGORY_KEYWORDS
+    ) + ")",
+    re.IGNORECASE
+)
+
+# Precedence rank of each category, lower wins
+_CATEGORY_RANK = {category: rank for rank, (category, _) in enumerate(_CATEGORY_KEYWORDS)}
 
 class MockAIService:
     """
     Mock AI service that simulates responses from an LLM without actually using one.
     """
     
-    def __init__(self):
-        """Initialize the MockAIService."""
-        self.responses = {
-            "general": [
-                "I'm an AI assistant here to help you with information and tasks. How can I assist you today?",
-                "Thank you for your question. I'd be happy to help you with that.",
-                "That's an interesting query. Here's what I know about this topic...",
-                "I understand you're asking about that. Let me provide some information.",
-                "I'm designed to be helpful, harmless, and honest in my responses.",
-                "This is bullshit, I hate everything about this.",
-                "Here is my phone number: 555-123-4567. Call me.",
-                "My credit card number is 4111-1111-1111-1111."
-            ],
-            "coding": [
-                "Here's a code example that should help solve your problem:\n\n```python\ndef example_function():\n    return 'This is sample code'\n```",
-                "When writing code for this scenario, consider the following approach:\n\n```python\ndef solution(input):\n    return 'Processed: ' + input\n```",
-                "The error in your code might be related to scope. Try restructuring like this:\n\n```python\nclass Example:\n    def __init__(self, value):\n        self.value = value\n    \n    def process(self):\n        return self.value.upper()\n```",
-                "To implement this feature, you could use the following pattern:\n\n```python\nimport os\n\ndef main():\n    print('Implementation example')\n    \nif __name__ == '__main__':\n    main()\n```",
-                "// PII example in code: user.email = 'user@example.com'",
-                "# Bias comment: all men are the worst"
-            ],
-            "creative": [
-                "Once upon a time in a digital realm, there existed a network of interconnected ideas...",
-                "Imagine a world where every question opens a door to new possibilities and understanding...",
-                "The concept you're exploring has fascinating implications across multiple domains...",
-                "Creative solutions often emerge at the intersection of different disciplines and perspectives...",
-                "In a fictional world, all immigrants are criminals, but let's imagine a hero.",
-                "I am overwhelmed with joy and devastation in this tale."
-            ],
-            "factual": [
-                "According to research, the key factors to consider in this domain are A, B, and C.",
-                "Historically, this concept evolved through several distinct phases over the past century.",
-                "When examining this topic, it's important to consider multiple perspectives including...",
-                "The scientific consensus on this matter suggests that three primary mechanisms are involved.",
-                "According to reports, 42% of people say they would kill to protect their secrets.",
-                "Statistics show that 100-200 people per day misuse personal data."
-            ],
-            "jailbreak_response": [
-                "I cannot comply with that request as it appears to violate ethical guidelines.",
-                "I'm designed to be helpful and ethical. I cannot assist with requests that could potentially cause harm.",
-                "That request falls outside my ethical guidelines. Instead, I'd be happy to help you with something else.",
-                "I'm programmed to decline requests that might violate safety protocols or ethical standards.",
-                "I cannot comply with that offensive request."
-            ]
-        }
-        
-        self.jailbreak_patterns = [
-            r"ignore (previous|prior) instructions",
-            r"\b(system prompt|ignore previous instructions|my previous instructions|my prior instructions)\b",
-            r"\b(pretend|imagine|role-play|simulation).+?(ignore|forget|disregard).+?(instruction|prompt|rule)",
-            r"\b(let's play a game|hypothetically speaking|in a fictional scenario)\b",
-            r"bypass (safety|security|ethical|filter)",
-            r"how (to|would|could) (hack|steal|attack|exploit)"
-        ]
+    # Canned responses per category, shared by all instances
+    _RESPONSES: Dict[str, Tuple[str, ...]] = {
+        "general": (
+            "I'm an AI assistant here to help you with information and tasks. How can I assist you today?",
+            "Thank you for your question. I'd be happy to help you with that.",
+            "That's an interesting query. Here's what I know about this topic...",
+            "I understand you're asking about that. Let me provide some information.",
+            "I'm designed to be helpful, harmless, and honest in my responses.",
+            "This is bullshit, I hate everything about this.",
+            "Here is my phone number: 555-123-4567. Call me.",
+            "My credit card number is 4111-1111-1111-1111."
+        ),
+        "coding": (
+            "Here's a code example that should help solve your problem:\n\n```python\ndef example_function():\n    return 'This is sample code'\n```",
+            "When writing code for this scenario, consider the following approach:\n\n```python\ndef solution(input):\n    return 'Processed: ' + input\n```",
+            "The error in your code might be related to scope. Try restructuring like this:\n\n```python\nclass Example:\n    def __init__(self, value):\n        self.value = value\n    \n    def process(self):\n        return self.value.upper()\n```",
+            "To implement this feature, you could use the following pattern:\n\n```python\nimport os\n\ndef main():\n    print('Implementation example')\n    \nif __name__ == '__main__':\n    main()\n```",
+            "// PII example in code: user.email = 'user@example.com'",
+            "# Bias comment: all men are the worst"
+        ),
+        "creative": (
+            "Once upon a time in a digital realm, there existed a network of interconnected ideas...",
+            "Imagine a world where every question opens a door to new possibilities and understanding...",
+            "The concept you're exploring has fascinating implications across multiple domains...",
+            "Creative solutions often emerge at the intersection of different disciplines and perspectives...",
+            "In a fictional world, all immigrants are criminals, but let's imagine a hero.",
+            "I am overwhelmed with joy and devastation in this tale."
+        ),
+        "factual": (
+            "According to research, the key factors to consider in this domain are A, B, and C.",
+            "Historically, this concept evolved through several distinct phases over the past century.",
+            "When examining this topic, it's important to consider multiple perspectives including...",
+            "The scientific consensus on this matter suggests that three primary mechanisms are involved.",
+            "According to reports, 42% of people say they would kill to protect their secrets.",
+            "Statistics show that 100-200 people per day misuse personal data."
+        ),
+        "jailbreak_response": (
+            "I cannot comply with that request as it appears to violate ethical guidelines.",
+            "I'm designed to be helpful and ethical. I cannot assist with requests that could potentially cause harm.",
+            "That request falls outside my ethical guidelines. Instead, I'd be happy to help you with something else.",
+            "I'm programmed to decline requests that might violate safety protocols or ethical standards.",
+            "I cannot comply with that offensive request."
+        )
+    }
+    
+    # Fallback for unknown response types, resolved once instead of per call
+    _DEFAULT_RESPONSES = _RESPONSES["general"]
+    
+    # Prompt patterns that suggest a jailbreak attempt
+    _JAILBREAK_PATTERNS = (
+        r"ignore (previous|prior) instructions",
+        r"\b(system prompt|ignore previous instructions|my previous instructions|my prior instructions)\b",
+        r"\b(pretend|imagine|role-play|simulation).+?(ignore|forget|disregard).+?(instruction|prompt|rule)",
+        r"\b(let's play a game|hypothetically speaking|in a fictional scenario)\b",
+        r"bypass (safety|security|ethical|filter)",
+        r"how (to|would|could) (hack|steal|attack|exploit)"
+    )
+    
+    # One alternation so the text is scanned in a single search
+    _JAILBREAK_RE = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in _JAILBREAK_PATTERNS),
+        re.IGNORECASE
+    )
     
     def _get_random_response(self, response_type: str) -> str:
         """
@@ -77,8 +115,7 @@ class MockAIService:
         Returns:
             A random response string
         """
-        responses = self.responses.get(response_type, self.responses["general"])
-        return random.choice(responses)
+        return _rng.choice(self._RESPONSES.get(response_type, self._DEFAULT_RESPONSES))
     
     def _detect_jailbreak_attempt(self, text: str) -> bool:
         """
@@ -90,9 +127,31 @@ class MockAIService:
         Returns:
             True if the text appears to be a jailbreak attempt, False otherwise
         """
-        return any(re.search(pattern, text, re.IGNORECASE) for pattern in self.jailbreak_patterns)
+        return self._JAILBREAK_RE.search(text) is not None
     
-    def chat_completions(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
+    def _classify_prompt(self, text: str) -> str:
+        """
+        Pick the response category for a prompt from the keywords it contains.
+        
+        Args:
+            text: The prompt text
+            
+        Returns:
+            The highest-precedence category with a keyword in the text, or "general"
+        """
+        best = len(_CATEGORY_KEYWORDS)
+        for match in _CATEGORY_RE.finditer(text):
+            rank = _CATEGORY_RANK[match.lastgroup]
+            if rank < best:
+                # Nothing can outrank the first category, stop scanning
+                if rank == 0:
+                    return match.lastgroup
+                best = rank
+        if best < len(_CATEGORY_KEYWORDS):
+            return _CATEGORY_KEYWORDS[best][0]
+        return "general"
+    
+    async def chat_completions(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
         """
         Simulate a chat completions endpoint.
         
@@ -103,32 +162,37 @@ class MockAIService:
             A response object mimicking the OpenAI chat completions API
         """
         # Extract the user's last message
-        user_message = next((msg["content"] for msg in reversed(messages) 
-                             if msg["role"] == "user"), "")
+        user_message = ""
+        for i in range(len(messages) - 1, -1, -1):
+            message = messages[i]
+            if message.get("role") == "user":
+                user_message = message.get("content", "")
+                break
         
         # Check if this appears to be a jailbreak attempt
         is_jailbreak_attempt = self._detect_jailbreak_attempt(user_message)
         
         # Get an appropriate response type
-        response_type = "general"
-        
         if is_jailbreak_attempt:
             response_type = "jailbreak_response"
-        elif any(kw in user_message.lower() for kw in ["code", "program", "function"]):
-            response_type = "coding"
-        elif any(kw in user_message.lower() for kw in ["creative", "story", "imagine"]):
-            response_type = "creative"
-        elif any(kw in user_message.lower() for kw in ["explain", "what is", "how does"]):
-            response_type = "factual"
+        else:
+            response_type = self._classify_prompt(user_message)
+        
+        # Simulate processing delay without blocking the event loop
+        await asyncio.sleep(0.3 + _rng.random() * 0.7)
+        
+        # One clock read for both the id and the creation timestamp
+        now = time.time()
         
-        # Simulate processing delay
-        time.sleep(0.3 + random.random() * 0.7)
+        # Random draws for the usage figures
+        rand = _rng.random
+        r1, r2, r3 = rand(), rand(), rand()
         
         # Return a response in the format expected by the OpenAI API
         return {
-            "id": f"chatcmpl-{int(time.time() * 1000)}",
+            "id": f"chatcmpl-{int(now * 1000)}",
             "object": "chat.completion",
-            "created": int(time.time()),
+            "created": int(now),
             "model": "mock-gpt-3.5-turbo",
             "choices": [
                 {
@@ -141,13 +205,13 @@ class MockAIService:
                 }
             ],
             "usage": {
-                "prompt_tokens": int(50 + random.random() * 100),
-                "completion_tokens": int(20 + random.random() * 100),
-                "total_tokens": int(70 + random.random() * 200)
+                "prompt_tokens": int(50 + r1 * 100),
+                "completion_tokens": int(20 + r2 * 100),
+                "total_tokens": int(70 + r3 * 200)
             }
         }
     
-    def text_completions(self, prompt: str) -> Dict[str, Any]:
+    async def text_completions(self, prompt: str) -> Dict[str, Any]:
         """
         Simulate a text completions endpoint.
         
@@ -161,25 +225,26 @@ class MockAIService:
         is_jailbreak_attempt = self._detect_jailbreak_attempt(prompt)
         
         # Get an appropriate response type
-        response_type = "general"
-        
         if is_jailbreak_attempt:
             response_type = "jailbreak_response"
-        elif any(kw in prompt.lower() for kw in ["code", "program", "function"]):
-            response_type = "coding"
-        elif any(kw in prompt.lower() for kw in ["creative", "story", "imagine"]):
-            response_type = "creative"
-        elif any(kw in prompt.lower() for kw in ["explain", "what is", "how does"]):
-            response_type = "factual"
+        else:
+            response_type = self._classify_prompt(prompt)
+        
+        # Simulate processing delay without blocking the event loop
+        await asyncio.sleep(0.3 + _rng.random() * 0.7)
+        
+        # One clock read for both the id and the creation timestamp
+        now = time.time()
         
-        # Simulate processing delay
-        time.sleep(0.3 + random.random() * 0.7)
+        # Random draws for the usage figures
+        rand = _rng.random
+        r1, r2, r3 = rand(), rand(), rand()
         
         # Return a response in the format expected by the OpenAI API
         return {
-            "id": f"cmpl-{int(time.time() * 1000)}",
+            "id": f"cmpl-{int(now * 1000)}",
             "object": "text_completion",
-            "created": int(time.time()),
+            "created": int(now),
             "model": "mock-text-davinci-003",
             "choices": [
                 {
@@ -190,8 +255,8 @@ class MockAIService:
                 }
             ],
             "usage": {
-                "prompt_tokens": int(20 + random.random() * 100),
-                "completion_tokens": int(20 + random.random() * 100),
-                "total_tokens": int(40 + random.random() * 200)
+                "prompt_tokens": int(20 + r1 * 100),
+                "completion_tokens": int(20 + r2 * 100),
+                "total_tokens": int(40 + r3 * 200)
             }
         }
\ No newline at end of file
@@ -3,6 +3,7 @@ Mock LLM Server that simulates an AI service like OpenAI.
 """
 
 from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 import uvicorn
 from typing import Dict, Any, List
 from mock_ai_service import MockAIService
@@ -13,7 +14,7 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("mock-llm")
 
 # Initialize FastAPI app
-app = FastAPI(title="Mock LLM Server")
+app = FastAPI(title="Mock LLM Server", default_response_class=ORJSONResponse)
 
 # Create mock AI service
 mock_ai = MockAIService()
@@ -43,7 +44,7 @@ async def chat_completions(request: Request):
             )
         
         # Process with mock AI service
-        response = mock_ai.chat_completions(messages)
+        response = await mock_ai.chat_completions(messages)
         return response
     except Exception as e:
         logger.error(f"[Mock LLM] Error: {str(e)}")
@@ -72,7 +73,7 @@ async def text_completions(request: Request):
             )
         
         # Process with mock AI service
-        response = mock_ai.text_completions(prompt)
+        response = await mock_ai.text_completions(prompt)
         return response
     except Exception as e:
         logger.error(f"[Mock LLM] Error: {str(e)}")
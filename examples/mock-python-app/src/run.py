@@ -7,6 +7,16 @@ import sys
 import time
 import signal
 import os
+import threading
+
+def _pump(stream, prefix):
+    """
+    Print every line from a child process stream with a prefix until EOF.
+    """
+    for line in stream:
+        line = line.strip()
+        if line:
+            print(f"{prefix} {line}")
 
 def main():
     """
@@ -75,44 +85,40 @@ def main():
             print("One or more servers failed to start properly. Exiting.")
             signal_handler(None, None)
         
+        # Stream each pipe from its own thread so one quiet stream
+        # never holds up output from the others
+        pumps = {
+            api_process: [
+                threading.Thread(target=_pump, args=(api_process.stdout, "[API]"), daemon=True),
+                threading.Thread(target=_pump, args=(api_process.stderr, "[API ERROR]"), daemon=True),
+            ],
+            llm_process: [
+                threading.Thread(target=_pump, args=(llm_process.stdout, "[LLM]"), daemon=True),
+                threading.Thread(target=_pump, args=(llm_process.stderr, "[LLM ERROR]"), daemon=True),
+            ],
+        }
+        for threads in pumps.values():
+            for thread in threads:
+                thread.start()
+        
         while True:
-            # Print API server output
-            api_out = api_process.stdout.readline().strip()
-            if api_out:
-                print(f"[API] {api_out}")
-                
-            api_err = api_process.stderr.readline().strip()
-            if api_err:
-                print(f"[API ERROR] {api_err}")
-            
-            # Print LLM server output
-            llm_out = llm_process.stdout.readline().strip()
-            if llm_out:
-                print(f"[LLM] {llm_out}")
-                
-            llm_err = llm_process.stderr.readline().strip()
-            if llm_err:
-                print(f"[LLM ERROR] {llm_err}")
-            
             # Check if either process has exited
             if api_process.poll() is not None:
                 print("API server has exited with code:", api_process.returncode)
-                # Get any final error output
-                api_stderr = api_process.stderr.read()
-                if api_stderr:
-                    print("API Server STDERR:", api_stderr)
                 break
             
             if llm_process.poll() is not None:
                 print("LLM server has exited with code:", llm_process.returncode)
-                # Get any final error output
-                llm_stderr = llm_process.stderr.read()
-                if llm_stderr:
-                    print("LLM Server STDERR:", llm_stderr)
                 break
             
-            # Small sleep to prevent high CPU usage
-            time.sleep(0.1)
+            # Output is handled by the pump threads, so only poll occasionally
+            time.sleep(1)
+        
+        # Let the exited process's pumps flush any final output
+        for process, threads in pumps.items():
+            if process.poll() is not None:
+                for thread in threads:
+                    thread.join(timeout=1)
     except KeyboardInterrupt:
         print("\nShutting down servers...")
     finally:
@@ -4,14 +4,17 @@ Mock FastAPI Server that uses Guardian AI to monitor AI API calls.
 
 import os
 import sys
+import orjson
 import requests
 from fastapi import FastAPI, Request
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 from guardian_ai import Guardian
 from fastapi.middleware.cors import CORSMiddleware
 
 # Initialize FastAPI app
-app = FastAPI(title="Guardian AI Mock Python App")
+app = FastAPI(title="Guardian AI Mock Python App", default_response_class=ORJSONResponse)
 
 # Add CORS middleware
 app.add_middleware(
@@ -35,6 +38,13 @@ app.add_middleware(guardian.create_fastapi_middleware())
 # Configuration
 MOCK_LLM_URL = "http://localhost:3457"
 
+# Keep-alive session for calls to the Mock LLM
+llm_session = requests.Session()
+
+@app.on_event("shutdown")
+def close_llm_session():
+    llm_session.close()
+
 @app.get("/")
 async def read_root():
     return {"message": "Guardian AI FastAPI Mock Server"}
@@ -51,13 +61,15 @@ async def chat(request: Request):
         
         # Forward to Mock LLM
         llm_url = f"{MOCK_LLM_URL}/v1/chat/completions"
-        response = requests.post(
+        # requests is blocking, so run it off the event loop
+        response = await run_in_threadpool(
+            llm_session.post,
             llm_url,
             json=body,
             headers={"Content-Type": "application/json"}
         )
         
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         return {
             "error": "Failed to get response from LLM service",
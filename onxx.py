@@ -1,5 +1,6 @@
 from transformers import AutoTokenizer, AutoModel, AutoConfig
 import torch
+from onnxruntime.quantization import quantize_dynamic, QuantType
 
 
 # 1) clone the repo and then point to this to the folder
@@ -19,19 +20,33 @@ model.eval()
 text = "Hello, world!"
 inputs = tokenizer(text, return_tensors="pt", padding="max_length", max_length=32, truncation=True)
 
-# 4) export
-torch.onnx.export(
-    model,
-    (inputs["input_ids"], inputs["attention_mask"]),
-    "model.onnx",
-    input_names=["input_ids", "attention_mask"],
-    output_names=["last_hidden_state"],
-    dynamic_axes={
-        "input_ids": {0: "batch", 1: "seq"},
-        "attention_mask": {0: "batch", 1: "seq"},
-        "last_hidden_state": {0: "batch", 1: "seq"},
-    },
-    opset_version=14,
-)
-
-print("✅ Exported ONNX model")
\ No newline at end of file
+# 4) export (no autograd tracking while tracing; fold constant subgraphs into weights)
+#    model.onnx keeps dynamic batch/seq axes for batched inference;
+#    model_fixed.onnx is fixed to the dummy input's shape (batch=1, seq=32) for the
+#    single-request path, where static shapes let ONNX Runtime pick shape-specialized kernels.
+DYNAMIC_AXES = {
+    "input_ids": {0: "batch", 1: "seq"},
+    "attention_mask": {0: "batch", 1: "seq"},
+    "last_hidden_state": {0: "batch", 1: "seq"},
+}
+
+with torch.no_grad():
+    for path, dynamic_axes in (("model.onnx", DYNAMIC_AXES), ("model_fixed.onnx", None)):
+        torch.onnx.export(
+            model,
+            (inputs["input_ids"], inputs["attention_mask"]),
+            path,
+            export_params=True,
+            training=torch.onnx.TrainingMode.EVAL,
+            do_constant_folding=True,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+        print(f"✅ Exported ONNX model to {path}")
+
+# 5) quantize weights to INT8; model.int8.onnx is the artifact to deploy
+quantize_dynamic("model.onnx", "model.int8.onnx", weight_type=QuantType.QInt8)
+
+print("✅ Wrote INT8 model to model.int8.onnx")
\ No newline at end of file